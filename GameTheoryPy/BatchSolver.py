@@ -0,0 +1,280 @@
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+from typing import Callable, Dict, Iterator, List, Tuple
+
+
+# Games read from a .npy or .npz file at a time.
+NPZ_BATCH_SIZE = 1024
+
+# Strategies for IterativeGame and EvolutionaryGame are looked up by name, since functions cannot
+# be written in the input files. A name of the form "constant:<action>" always plays that action.
+
+def tit_for_tat(player, player_list: List, history: Dict[str, List], actions_list: List):
+  opponent_player = [i for i in player_list if i != player][0]
+  if len(history[opponent_player]) == 0:
+    return actions_list[0]
+  return history[opponent_player][-1]
+
+
+def tit_for_two_tat(player, player_list: List, history: Dict[str, List], actions_list: List):
+  opponent_player = [i for i in player_list if i != player][0]
+  if len(history[opponent_player]) < 2 or history[opponent_player][-1] != history[opponent_player][-2]:
+    return actions_list[0]
+  return history[opponent_player][-1]
+
+
+def grim_trigger(player, player_list: List, history: Dict[str, List], actions_list: List):
+  opponent_player = [i for i in player_list if i != player][0]
+  if all(action == actions_list[0] for action in history[opponent_player]):
+    return actions_list[0]
+  return actions_list[-1]
+
+
+def random_action(player, player_list: List, history: Dict[str, List], actions_list: List):
+  return random.choice(actions_list)
+
+
+STRATEGIES = {
+  "tit_for_tat": tit_for_tat,
+  "tit_for_two_tat": tit_for_two_tat,
+  "grim_trigger": grim_trigger,
+  "random": random_action,
+}
+
+
+def get_strategy(name: str, actions_list: List) -> Callable:
+  if name.startswith("constant:"):
+    constant_action = name[len("constant:"):]
+    # Actions may be numbers in the input file
+    action = [action for action in actions_list if str(action) == constant_action]
+    assert len(action) == 1, "Unknown action in strategy {}".format(name)
+    return lambda player, player_list, history: action[0]
+  assert name in STRATEGIES, "Unknown strategy {}".format(name)
+  return lambda player, player_list, history: STRATEGIES[name](player, player_list, history, actions_list)
+
+
+def get_payoff_function(record: Dict, player_count: int, actions_list: List):
+  # "payoff_function" is a list of [strategy, payoffs] pairs and "payoff_tensor" is a nested list,
+  # or an array from a .npy or .npz file, of shape (a, ..., a, n) in the order of the actions in
+  # actions_list.
+  if "payoff_function" in record:
+    return {tuple(strategy): list(payoffs) for strategy, payoffs in record["payoff_function"]}
+  payoff_tensor = record["payoff_tensor"]
+  if hasattr(payoff_tensor, "reshape"):
+    payoff_rows = payoff_tensor.reshape(-1, player_count).tolist()
+  else:
+    payoff_rows = payoff_tensor
+    for _ in range(player_count-1):
+      payoff_rows = [payoffs for rows in payoff_rows for payoffs in rows]
+  strategy_list = itertools.product(actions_list, repeat=player_count)
+  return {strategy: [float(payoff) for payoff in payoffs] for strategy, payoffs in zip(strategy_list, payoff_rows)}
+
+
+def parse_line(line_number: int, line: str):
+  try:
+    record = json.loads(line)
+  except ValueError as e:
+    raise ValueError("Line {} is not valid JSON: {}".format(line_number, e))
+  if not isinstance(record, dict):
+    raise ValueError("Line {} is not a JSON object".format(line_number))
+  return record
+
+
+def solve_record(record):
+  # record is a game from an .npz file or a (line number, line) pair from a JSONL file, which is
+  # parsed here so that a malformed line only fails its own result.
+  from GameTheoryPy.SimpleGame import SimpleGame
+  from GameTheoryPy.IterativeGame import IterativeGame
+  from GameTheoryPy.EvolutionaryGame import EvolutionaryGame
+
+  result = {"id": None}
+  line_number = None
+  try:
+    if isinstance(record, tuple):
+      line_number, line = record
+      record = parse_line(line_number, line)
+    result["id"] = record.get("id")
+    if "seed" in record:
+      random.seed(record["seed"])
+    game = record.get("game", "simple")
+    actions_list = record["actions"]
+
+    if game == "evolutionary":
+      payoff_function = get_payoff_function(record, 2, actions_list)
+      strategy_function = {name: get_strategy(strategy, actions_list) for name, strategy in record["strategies"].items()}
+      evolutionary_game = EvolutionaryGame(record["generations_count"], record["game_count"], record["iter_count"], strategy_function, record["agent_distribution"], payoff_function, record.get("execution_error", 0), record.get("mutation_rate", 0), record.get("seed"))
+      result["generations"] = evolutionary_game.simulate(verbose=False)
+      return result
+
+    player_list = record["players"]
+    payoff_function = get_payoff_function(record, len(player_list), actions_list)
+    if game == "simple":
+      simple_game = SimpleGame(player_list, actions_list, payoff_function)
+      result["nash_states"] = [list(strategy) for strategy in sorted(simple_game.calculate_nash_states(), key=str)]
+    elif game == "correlated":
+      simple_game = SimpleGame(player_list, actions_list, payoff_function)
+      distribution = simple_game.calculate_correlated_equilibrium(record.get("objective", "welfare"), record.get("coarse", False))
+      result["distribution"] = [[list(strategy), prob] for strategy, prob in distribution.items()]
+    elif game == "iterative":
+      strategy_function = {player: get_strategy(record["strategies"][player], actions_list) for player in player_list}
+      iterative_game = IterativeGame(player_list, actions_list, payoff_function, strategy_function, record["iter_count"])
+      result["total_payoffs"] = iterative_game.play_game(verbose=False)
+    else:
+      raise ValueError("Unknown game {}".format(game))
+  except Exception as e:
+    result["error"] = "{}: {}".format(type(e).__name__, e)
+    if line_number is not None:
+      result["line"] = line_number
+  return result
+
+
+def read_jsonl(path: str) -> Iterator[Tuple[int, str]]:
+  f = sys.stdin if path == "-" else open(path)
+  try:
+    for line_number, line in enumerate(f, 1):
+      line = line.strip()
+      if line:
+        yield (line_number, line)
+  finally:
+    if f is not sys.stdin:
+      f.close()
+
+
+def read_npy_batches(f, batch_size: int):
+  # Reads the array in the .npy stream f batch_size entries of its first axis at a time.
+  import numpy as np
+  version = np.lib.format.read_magic(f)
+  read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+  shape, fortran_order, dtype = read_header(f)
+  assert not dtype.hasobject
+  if fortran_order:
+    # The first axis varies fastest on disk, so a batch of games is not contiguous
+    array = np.frombuffer(f.read(), dtype=dtype).reshape(shape[::-1]).transpose()
+    for start in range(0, shape[0], batch_size):
+      yield array[start:start+batch_size]
+    return
+  entry_shape = shape[1:]
+  entry_size = dtype.itemsize*int(np.prod(entry_shape))
+  for start in range(0, shape[0], batch_size):
+    count = min(batch_size, shape[0]-start)
+    yield np.frombuffer(f.read(count*entry_size), dtype=dtype).reshape((count, ) + entry_shape)
+
+
+def read_npy_records(f, game: str, players: List, actions: List) -> Iterator[Dict]:
+  g = 0
+  for batch in read_npy_batches(f, NPZ_BATCH_SIZE):
+    if players is None:
+      players = list(range(batch.shape[-1]))
+    if actions is None:
+      actions = list(range(batch.shape[1]))
+    for payoff_tensor in batch:
+      yield {"id": g, "game": game, "players": players, "actions": actions, "payoff_tensor": payoff_tensor}
+      g += 1
+
+
+def read_npz(path: str, game: str) -> Iterator[Dict]:
+  # The file holds "payoff_tensor" of shape (games, a, ..., a, n) and optionally "players" and
+  # "actions", or is a .npy file of the payoff tensor alone. Every game in the file is solved the
+  # same way. The payoff tensor is read NPZ_BATCH_SIZE games at a time, so files larger than the
+  # memory can be solved.
+  import zipfile
+  import numpy as np
+  if path.endswith(".npy"):
+    with open(path, "rb") as f:
+      yield from read_npy_records(f, game, None, None)
+    return
+
+  with np.load(path) as data:
+    players = data["players"].tolist() if "players" in data else None
+    actions = data["actions"].tolist() if "actions" in data else None
+  with zipfile.ZipFile(path) as archive, archive.open("payoff_tensor.npy") as f:
+    yield from read_npy_records(f, game, players, actions)
+
+
+def read_records(paths: List[str], game: str) -> Iterator:
+  for path in paths:
+    if path.endswith(".npz") or path.endswith(".npy"):
+      yield from read_npz(path, game)
+    else:
+      yield from read_jsonl(path)
+
+
+def solve_chunk(chunk: List) -> List[Dict]:
+  return [solve_record(record) for record in chunk]
+
+
+def get_chunks(records: Iterator, chunk_size: int) -> Iterator[List]:
+  chunk = []
+  for record in records:
+    chunk.append(record)
+    if len(chunk) == chunk_size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+
+def solve_records(records: Iterator, workers: int, chunk_size: int) -> Iterator[Dict]:
+  # Results come out in the order of the input. One imap over chunks of games keeps the workers
+  # busy the whole time, and a semaphore released for every chunk of results stops the pool from
+  # reading more than a few chunks per worker ahead, so memory stays bounded however many games
+  # are in the files. The pool threads only hand over work once per chunk, which is what makes
+  # large chunks cheap.
+  if workers <= 1:
+    yield from map(solve_record, records)
+    return
+
+  import threading
+  from multiprocessing import Pool
+  max_in_flight = workers*4
+  in_flight = threading.Semaphore(max_in_flight)
+  stopped = threading.Event()
+
+  def bounded_chunks():
+    # Runs in the task handler thread of the pool
+    for chunk in get_chunks(records, chunk_size):
+      in_flight.acquire()
+      if stopped.is_set():
+        return
+      yield chunk
+
+  with Pool(workers) as pool:
+    try:
+      for results in pool.imap(solve_chunk, bounded_chunks()):
+        in_flight.release()
+        yield from results
+    finally:
+      # When the results are not all read, e.g. the output pipe was closed, the task handler
+      # thread may be waiting for a permit. It has to finish before the pool can terminate.
+      stopped.set()
+      in_flight.release(max_in_flight)
+
+
+def main(argv: List[str] = None):
+  parser = argparse.ArgumentParser(prog="python -m GameTheoryPy", description="Solve many games from JSONL or .npz files and write the results as JSONL.")
+  parser.add_argument("inputs", nargs="+", help="JSONL files with one game per line, .npz or .npy payoff files, or - for stdin.")
+  parser.add_argument("-o", "--output", default="-", help="Output JSONL file, stdout by default.")
+  parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes.")
+  parser.add_argument("--chunk-size", type=int, default=256, help="Games sent to a worker at a time.")
+  parser.add_argument("--game", default="simple", choices=["simple", "correlated"], help="How the games in .npz and .npy files are solved.")
+  args = parser.parse_args(argv)
+
+  records = read_records(args.inputs, args.game)
+  out = sys.stdout if args.output == "-" else open(args.output, "w")
+  try:
+    for result in solve_records(records, args.workers, args.chunk_size):
+      out.write(json.dumps(result) + "\n")
+    out.flush()
+  except BrokenPipeError:
+    # The reader of the output went away, e.g. `| head`. Point stdout at devnull so that flushing
+    # it again at exit does not raise a second time.
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    sys.exit(1)
+  finally:
+    if out is not sys.stdout:
+      out.close()
@@ -0,0 +1,201 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+
+# Imported by SimpleGame, see there for why typing is left to type checkers.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+  from typing import Dict, List, Tuple
+
+
+class CompactPayoff(ABC):
+  # Base class for payoff functions that are not stored as a table of all a^n strategies.
+  # Indexing with a strategy returns the payoffs of all the players like the dict form does.
+  # Subclasses implement get_payoff and can override get_neighbours, validate and
+  # calculate_nash_states.
+
+  def __init__(self, player_list: List, actions_list: List):
+    self.player_list = player_list
+    self.actions_list = actions_list
+
+  def validate(self, player_list: List, actions_list: List):
+    assert list(player_list) == list(self.player_list)
+    assert list(actions_list) == list(self.actions_list)
+
+  @abstractmethod
+  def get_payoff(self, strategy: Tuple, player_index: int):
+    # Payoff of the player at player_index when the players play strategy.
+    pass
+
+  def __getitem__(self, strategy: Tuple):
+    assert len(strategy) == len(self.player_list)
+    return [self.get_payoff(strategy, i) for i in range(len(self.player_list))]
+
+  def get_neighbours(self, player_index: int):
+    # Indices of the players whose actions affect the payoff of player_index.
+    return [i for i in range(len(self.player_list)) if i != player_index]
+
+  def is_best_response(self, strategy: List, player_index: int):
+    current_payoff = self.get_payoff(strategy, player_index)
+    deviation = list(strategy)
+    for action in self.actions_list:
+      deviation[player_index] = action
+      if self.get_payoff(deviation, player_index) > current_payoff:
+        return False
+    return True
+
+  def calculate_nash_states(self):
+    # Backtracking search over the players in order. A player is checked as soon as the
+    # actions of all its neighbours are assigned, so sparse games prune early.
+    n = len(self.player_list)
+    check_at = [[] for _ in range(n)]
+    for i in range(n):
+      check_at[max([i] + list(self.get_neighbours(i)))].append(i)
+
+    nash_states = []
+    strategy = [None]*n
+
+    def search(k):
+      if k == n:
+        nash_states.append(tuple(strategy))
+        return
+      for action in self.actions_list:
+        strategy[k] = action
+        if all(self.is_best_response(strategy, i) for i in check_at[k]):
+          search(k+1)
+      strategy[k] = None
+
+    search(0)
+    return nash_states
+
+
+class SymmetricPayoff(CompactPayoff):
+  # payoff_function maps (action, counts) to the payoff of a player playing action while the
+  # other n-1 players play action k of actions_list counts[k] times.
+
+  def __init__(self, player_list: List, actions_list: List, payoff_function: Dict[Tuple, float]):
+    super().__init__(player_list, actions_list)
+    self.payoff_function = payoff_function
+
+  @staticmethod
+  def count_vectors(total: int, size: int):
+    if size == 1:
+      yield (total, )
+      return
+    for first in range(total, -1, -1):
+      for rest in SymmetricPayoff.count_vectors(total-first, size-1):
+        yield (first, ) + rest
+
+  def validate(self, player_list: List, actions_list: List):
+    from math import comb
+    super().validate(player_list, actions_list)
+    n = len(player_list)
+    a = len(actions_list)
+    assert len(self.payoff_function) == a*comb(n+a-2, a-1)
+    for (action, counts) in self.payoff_function.keys():
+      assert action in actions_list
+      assert len(counts) == a
+      assert sum(counts) == n-1
+
+  def get_counts(self, strategy: Tuple, player_index: int):
+    counts = [0]*len(self.actions_list)
+    for i in range(len(strategy)):
+      if i != player_index:
+        counts[self.actions_list.index(strategy[i])] += 1
+    return counts
+
+  def get_payoff(self, strategy: Tuple, player_index: int):
+    counts = self.get_counts(strategy, player_index)
+    return self.payoff_function[(strategy[player_index], tuple(counts))]
+
+  def calculate_nash_states(self):
+    # Every permutation of a Nash state is also a Nash state, so only one strategy per
+    # count vector is returned, with the players taking the actions in actions_list order.
+    n = len(self.player_list)
+    a = len(self.actions_list)
+    nash_states = []
+    for counts in SymmetricPayoff.count_vectors(n, a):
+      is_nash = True
+      for k in range(a):
+        if counts[k] == 0:
+          continue
+        other_counts = list(counts)
+        other_counts[k] -= 1
+        other_counts = tuple(other_counts)
+        current_payoff = self.payoff_function[(self.actions_list[k], other_counts)]
+        if any(self.payoff_function[(action, other_counts)] > current_payoff for action in self.actions_list):
+          is_nash = False
+          break
+      if is_nash:
+        strategy = ()
+        for k in range(a):
+          strategy += (self.actions_list[k], )*counts[k]
+        nash_states.append(strategy)
+    return nash_states
+
+
+class PolymatrixPayoff(CompactPayoff):
+  # payoff_function maps a pair of players (p, q) to the payoff table of p against q keyed by
+  # (action of p, action of q). The payoff of a player is the sum over all of its pairs.
+
+  def __init__(self, player_list: List, actions_list: List, payoff_function: Dict[Tuple, Dict[Tuple, float]]):
+    super().__init__(player_list, actions_list)
+    self.payoff_function = payoff_function
+    self.neighbours = [[] for _ in player_list]
+    for (p, q) in payoff_function.keys():
+      self.neighbours[player_list.index(p)].append(player_list.index(q))
+
+  def validate(self, player_list: List, actions_list: List):
+    super().validate(player_list, actions_list)
+    a = len(actions_list)
+    for (p, q), table in self.payoff_function.items():
+      assert p in player_list and q in player_list and p != q
+      assert len(table) == a**2
+      for key in table.keys():
+        assert len(key) == 2
+        assert key[0] in actions_list and key[1] in actions_list
+
+  def get_neighbours(self, player_index: int):
+    return self.neighbours[player_index]
+
+  def get_payoff(self, strategy: Tuple, player_index: int):
+    player = self.player_list[player_index]
+    payoff = 0
+    for other_index in self.neighbours[player_index]:
+      table = self.payoff_function[(player, self.player_list[other_index])]
+      payoff += table[(strategy[player_index], strategy[other_index])]
+    return payoff
+
+
+class GraphicalPayoff(CompactPayoff):
+  # neighbour_list maps each player to the players its payoff depends on and payoff_function
+  # maps each player to its local payoff table keyed by the actions of the player followed by
+  # the actions of its neighbours in order.
+
+  def __init__(self, player_list: List, actions_list: List, neighbour_list: Dict[str, List], payoff_function: Dict[str, Dict[Tuple, float]]):
+    super().__init__(player_list, actions_list)
+    self.neighbour_list = neighbour_list
+    self.payoff_function = payoff_function
+    self.neighbours = [[player_list.index(q) for q in neighbour_list.get(p, [])] for p in player_list]
+
+  def validate(self, player_list: List, actions_list: List):
+    super().validate(player_list, actions_list)
+    a = len(actions_list)
+    assert set(self.payoff_function.keys()) == set(player_list)
+    for player in player_list:
+      neighbours = self.neighbour_list.get(player, [])
+      assert player not in neighbours
+      for q in neighbours:
+        assert q in player_list
+      table = self.payoff_function[player]
+      assert len(table) == a**(len(neighbours)+1)
+      for key in table.keys():
+        assert len(key) == len(neighbours)+1
+        for action in key:
+          assert action in actions_list
+
+  def get_neighbours(self, player_index: int):
+    return self.neighbours[player_index]
+
+  def get_payoff(self, strategy: Tuple, player_index: int):
+    local_strategy = (strategy[player_index], ) + tuple(strategy[i] for i in self.neighbours[player_index])
+    return self.payoff_function[self.player_list[player_index]][local_strategy]
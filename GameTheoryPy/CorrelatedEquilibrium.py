@@ -0,0 +1,190 @@
+import itertools
+import numpy as np
+from typing import Dict, List, Tuple
+from GameTheoryPy.CompactGame import CompactPayoff
+
+
+TOLERANCE = 1e-9
+# Entries of the entering column smaller than this are never pivoted on, since dividing by them
+# leaves a basis that is singular up to rounding.
+PIVOT_TOLERANCE = 1e-7
+# The right hand side of the simplex is raised by up to this much to break degenerate vertices.
+PERTURBATION = 1e-7
+# Number of pivots in a row without progress before switching to Bland's rule to avoid cycling.
+DEGENERATE_PIVOT_LIMIT = 50
+# Number of pivots between recomputing the basis inverse from the constraints.
+REFACTOR_INTERVAL = 100
+
+
+def check_full_payoff_function(player_list: List, actions_list: List, payoff_function):
+  if isinstance(payoff_function, CompactPayoff):
+    raise ValueError("{} would have to be expanded to all {}^{} strategies, only the full payoff_function dict is supported".format(type(payoff_function).__name__, len(actions_list), len(player_list)))
+
+
+def get_payoff_tensor(player_list: List, actions_list: List, payoff_function: Dict[Tuple, List[float]]):
+  # Returns an array of shape (n, a, ..., a) where tensor[i][s] is the payoff of player i when
+  # the players play the action indices s.
+  check_full_payoff_function(player_list, actions_list, payoff_function)
+  n = len(player_list)
+  a = len(actions_list)
+  payoffs = np.array([payoff_function[strategy] for strategy in itertools.product(actions_list, repeat=n)], dtype=float)
+  return np.moveaxis(payoffs.reshape((a, )*n + (n, )), -1, 0)
+
+
+def get_ce_constraints(payoff_tensor: np.ndarray):
+  # One row for every player i and pair of actions (k, l): the gain of player i from playing l
+  # whenever it is recommended k, which has to be at most 0.
+  n = payoff_tensor.shape[0]
+  a = payoff_tensor.shape[1]
+  identity = np.eye(a)
+  rows = []
+  for i in range(n):
+    player_payoff = np.moveaxis(payoff_tensor[i], i, 0).reshape(a, -1)
+    # gain[k, l, s] = u_i(l, s) - u_i(k, s) for every strategy s of the other players
+    gain = player_payoff[None, :, :] - player_payoff[:, None, :]
+    # Only the strategies where player i plays k take part in row (k, l)
+    player_rows = gain[:, :, None, :]*identity[:, None, :, None]
+    player_rows = player_rows.reshape((a, a, a) + payoff_tensor.shape[1:i+1] + payoff_tensor.shape[i+2:])
+    player_rows = np.moveaxis(player_rows, 2, 2+i).reshape(a*a, -1)
+    off_diagonal = ~np.eye(a, dtype=bool).reshape(-1)
+    rows.append(player_rows[off_diagonal])
+  return np.concatenate(rows)
+
+
+def get_cce_constraints(payoff_tensor: np.ndarray):
+  # One row for every player i and action l: the gain of player i from always playing l
+  # instead of following the recommendation, which has to be at most 0.
+  n = payoff_tensor.shape[0]
+  a = payoff_tensor.shape[1]
+  rows = []
+  for i in range(n):
+    player_payoff = payoff_tensor[i]
+    deviation_payoff = np.moveaxis(player_payoff, i, 0)
+    for l in range(a):
+      fixed_payoff = np.broadcast_to(deviation_payoff[l:l+1], deviation_payoff.shape)
+      rows.append((np.moveaxis(fixed_payoff, 0, i) - player_payoff).reshape(-1))
+  return np.array(rows)
+
+
+def run_simplex(constraints: np.ndarray, rhs: np.ndarray, cost: np.ndarray, basis: List[int]):
+  # Revised simplex minimising cost.x from the feasible basis, updating basis in place. The
+  # inverse of the basis is updated with each pivot and recomputed every REFACTOR_INTERVAL pivots
+  # so rounding errors do not build up. The entering column has the most negative reduced cost
+  # until the objective stalls, then Bland's rule is used for good since only it is guaranteed not
+  # to cycle. Entries below PIVOT_TOLERANCE are never pivoted on, and ties in the ratio test go to
+  # the largest pivot, or to the smallest column with Bland's rule.
+  degenerate_pivots = 0
+  pivot_count = REFACTOR_INTERVAL
+  while True:
+    if pivot_count == REFACTOR_INTERVAL:
+      basis_inverse = np.linalg.inv(constraints[:, basis])
+      x_basis = basis_inverse @ rhs
+      pivot_count = 0
+
+    dual = cost[basis] @ basis_inverse
+    reduced_cost = cost - dual @ constraints
+    reduced_cost[basis] = 0
+    bland = degenerate_pivots >= DEGENERATE_PIVOT_LIMIT
+    if not bland:
+      col = int(np.argmin(reduced_cost))
+      if reduced_cost[col] >= -TOLERANCE:
+        return
+    else:
+      candidates = np.nonzero(reduced_cost < -TOLERANCE)[0]
+      if len(candidates) == 0:
+        return
+      col = int(candidates[0])
+
+    direction = basis_inverse @ constraints[:, col]
+    rows = np.nonzero(direction > PIVOT_TOLERANCE)[0]
+    if len(rows) == 0:
+      raise ValueError("The linear program is unbounded")
+    ratios = np.maximum(x_basis[rows], 0)/direction[rows]
+    tied_rows = rows[ratios <= ratios.min() + TOLERANCE]
+    if bland:
+      row = int(min(tied_rows, key=lambda r: basis[r]))
+    else:
+      row = int(tied_rows[np.argmax(direction[tied_rows])])
+    step = max(x_basis[row], 0)/direction[row]
+
+    if not bland:
+      degenerate_pivots = degenerate_pivots + 1 if -reduced_cost[col]*step <= TOLERANCE else 0
+    x_basis -= step*direction
+    x_basis[row] = step
+    pivot_row = basis_inverse[row]/direction[row]
+    basis_inverse -= np.outer(direction, pivot_row)
+    basis_inverse[row] = pivot_row
+    basis[row] = col
+    pivot_count += 1
+
+
+def simplex(c: np.ndarray, A_ub: np.ndarray):
+  # Maximises c.x over the distributions x with A_ub.x <= 0. Most constraints of the equilibrium
+  # polytope meet at 0, so the simplex is run on the dual problem instead
+  #   minimise z subject to A_ub^T.y + z >= c and y >= 0
+  # which starts from a feasible basis and whose right hand side c is raised by a different tiny
+  # amount for each strategy so no vertex is degenerate. x is read off the optimal basis as the
+  # multipliers of the dual constraints, so it is feasible whatever the perturbation and its value
+  # is within PERTURBATION of the optimum.
+  ub_count, var_count = A_ub.shape
+  c = np.asarray(c, dtype=float)
+  # z = shift + z' with z' >= 0. The optimum is at least min(c), so z' stays above 0 there and the
+  # multipliers of its basis sum to 1.
+  shift = c.min() - 1
+
+  # Columns: y, z', one surplus per strategy
+  constraints = np.zeros((var_count, ub_count + 1 + var_count))
+  constraints[:, :ub_count] = A_ub.T
+  constraints[:, ub_count] = 1
+  constraints[:, ub_count+1:] = -np.eye(var_count)
+  rhs = c - shift + PERTURBATION*(1 + np.random.default_rng(0).random(var_count))
+  cost = np.zeros(ub_count + 1 + var_count)
+  cost[ub_count] = 1
+
+  # y = 0 and z' = max(rhs) is feasible, with every surplus basic except the one at the maximum
+  top = int(np.argmax(rhs))
+  basis = [ub_count] + [ub_count + 1 + j for j in range(var_count) if j != top]
+  run_simplex(constraints, rhs, cost, basis)
+
+  x = np.linalg.solve(constraints[:, basis].T, cost[basis])
+  return np.maximum(x, 0)
+
+
+def linprog(c: np.ndarray, A_ub: np.ndarray):
+  # Same as simplex, but solved with the HiGHS solver of SciPy when SciPy is installed. SciPy is
+  # not a dependency of the package, so simplex is kept for when it is missing.
+  try:
+    from scipy.optimize import linprog as scipy_linprog
+  except ImportError:
+    return simplex(c, A_ub)
+  A_eq = np.ones((1, A_ub.shape[1]))
+  result = scipy_linprog(-np.asarray(c, dtype=float), A_ub=A_ub, b_ub=np.zeros(len(A_ub)), A_eq=A_eq, b_eq=np.ones(1), bounds=(0, None), method="highs")
+  if result.status != 0:
+    raise ValueError("The linear program could not be solved: {}".format(result.message))
+  return np.maximum(result.x, 0)
+
+
+def get_objective(player_list: List, actions_list: List, payoff_tensor: np.ndarray, objective):
+  # objective is "welfare" for the sum of the payoffs, a player for the payoff of that player or
+  # a dict of weights for each strategy.
+  n = len(player_list)
+  if isinstance(objective, dict):
+    return np.array([objective.get(strategy, 0) for strategy in itertools.product(actions_list, repeat=n)], dtype=float)
+  if objective == "welfare":
+    return payoff_tensor.sum(axis=0).reshape(-1)
+  assert objective in player_list
+  return payoff_tensor[player_list.index(objective)].reshape(-1)
+
+
+def calculate_correlated_equilibrium(player_list: List, actions_list: List, payoff_function: Dict[Tuple, List[float]], objective="welfare", coarse: bool = False):
+  n = len(player_list)
+  payoff_tensor = get_payoff_tensor(player_list, actions_list, payoff_function)
+  A_ub = get_cce_constraints(payoff_tensor) if coarse else get_ce_constraints(payoff_tensor)
+  c = get_objective(player_list, actions_list, payoff_tensor, objective)
+  x = linprog(c, A_ub)
+
+  distribution = {}
+  for strategy, prob in zip(itertools.product(actions_list, repeat=n), x):
+    if prob > TOLERANCE:
+      distribution[strategy] = float(prob)
+  return distribution
@@ -29,11 +29,11 @@ class AgentSet:
         self.agent_set[strategy_name].append(Agent(self.agent_count, strategy_name, self.strategy_function[strategy_name]))
         self.agent_count += 1
 
-  def fetch_agent_list(self):
+  def fetch_agent_list(self, rng = random):
     agent_list = []
     for lst in self.agent_set.values():
       agent_list.extend(lst)
-    random.shuffle(agent_list)
+    rng.shuffle(agent_list)
     return agent_list
 
   def get_total_strategy_payoff(self):
@@ -61,10 +61,31 @@ class AgentSet:
 
     return agent_distribution
 
-  def update_generation(self):
+  def mutate_distribution(self, agent_distribution: Dict[str, int], mutation_rate: float, rng):
+    # Every agent switches to one of the other strategies with probability mutation_rate. Only the
+    # number of mutants leaving each strategy and where they go are drawn, not a draw per agent.
+    strategy_list = list(agent_distribution.keys())
+    if len(strategy_list) < 2:
+      return agent_distribution
+    counts = [agent_distribution[strategy] for strategy in strategy_list]
+    mutants = rng.binomial(counts, mutation_rate)
+    new_counts = [counts[i] - int(mutants[i]) for i in range(len(strategy_list))]
+    uniform = [1/(len(strategy_list)-1)]*(len(strategy_list)-1)
+    for i in range(len(strategy_list)):
+      if mutants[i] == 0:
+        continue
+      targets = rng.multinomial(mutants[i], uniform)
+      other_indices = [j for j in range(len(strategy_list)) if j != i]
+      for k in range(len(other_indices)):
+        new_counts[other_indices[k]] += int(targets[k])
+    return {strategy_list[i]: new_counts[i] for i in range(len(strategy_list))}
+
+  def update_generation(self, mutation_rate: float = 0, rng = None):
     avg_strategy_payoff = self.get_total_strategy_payoff()
 
     agent_distribution = self.get_agent_distribution(avg_strategy_payoff)
+    if mutation_rate > 0:
+      agent_distribution = self.mutate_distribution(agent_distribution, mutation_rate, rng)
 
     self.agent_set = {}
     self.agent_count = 0
@@ -88,43 +109,61 @@ class AgentSet:
 
 class EvolutionaryGame:
   
-  def __init__(self, generations_count: int, game_count: int, iter_count: int, strategy_function: Dict[str, Callable], agent_distribution: Dict[str, int], payoff_function: Dict[Tuple, List[float]]):
+  def __init__(self, generations_count: int, game_count: int, iter_count: int, strategy_function: Dict[str, Callable], agent_distribution: Dict[str, int], payoff_function: Dict[Tuple, List[float]], execution_error: float = 0, mutation_rate: float = 0, seed: int = None):
     self.generations_count = generations_count
     self.game_count = game_count
     self.iter_count = iter_count
     self.strategy_function = strategy_function
     self.payoff_function = payoff_function
     self.agent_distribution = agent_distribution
-    EvolutionaryGame.validate(strategy_function, agent_distribution, payoff_function)
+    # execution_error is the probability that an agent plays a different action than its strategy
+    # chose, and mutation_rate the probability that an agent switches strategy between generations.
+    self.execution_error = execution_error
+    self.mutation_rate = mutation_rate
+    EvolutionaryGame.validate(strategy_function, agent_distribution, payoff_function, execution_error, mutation_rate)
     self.agent_set = AgentSet(self.agent_distribution, self.strategy_function)
+    self.actions_list = []
+    for key in payoff_function.keys():
+      for action in key:
+        if action not in self.actions_list:
+          self.actions_list.append(action)
+    # seed makes the pairing of agents and the noise reproducible, but not any randomness inside
+    # the strategy functions. Without a seed the pairing uses the global random module as before.
+    self.random = random.Random(seed) if seed is not None else random
+    self.rng = None
+    if execution_error > 0 or mutation_rate > 0:
+      # numpy is only needed for the noise, so noiseless games do not import it
+      import numpy as np
+      self.rng = np.random.default_rng(seed)
 
   @staticmethod
-  def validate(strategy_function: Dict[str, Callable], agent_distribution: Dict[str, int], payoff_function: Dict[Tuple, List[float]]):
+  def validate(strategy_function: Dict[str, Callable], agent_distribution: Dict[str, int], payoff_function: Dict[Tuple, List[float]], execution_error: float = 0, mutation_rate: float = 0):
     for key in payoff_function.keys():
       assert len(key) == 2
       assert len(payoff_function[key]) == 2
     strategies = set(strategy_function.keys())
     assert strategies == set(agent_distribution.keys())
     assert sum(agent_distribution.values()) % 2 == 0
+    assert 0 <= execution_error <= 1
+    assert 0 <= mutation_rate <= 1
 
   @staticmethod
   def match_pairs(agent_list: List[Agent]):
-    def pop_random(lst: List[Agent]):
-      idx = random.randrange(0, len(lst))
-      return lst.pop(idx)
-
-    lst = agent_list.copy()
+    # agent_list comes shuffled from AgentSet.fetch_agent_list, so pairing neighbours gives a
+    # uniformly random matching
     pairs = []
-    while lst:
-      rand1 = pop_random(lst)
-      rand2 = pop_random(lst)
-      pair = (rand1, rand2)
-      pairs.append(pair)
+    for i in range(0, len(agent_list) - 1, 2):
+      pairs.append((agent_list[i], agent_list[i+1]))
 
     return pairs
 
   @staticmethod
-  def play_game(iter_count, agent1: Agent, agent2: Agent, payoff_function: Dict[Tuple, List[float]]):
+  def play_game(iter_count, agent1: Agent, agent2: Agent, payoff_function: Dict[Tuple, List[float]], trembles = None, actions_list: List = None):
+    # trembles is an array of shape (iter_count, 2) where trembles[iter][player_num] is 0 when the
+    # agent plays its chosen action and otherwise the offset in actions_list of the action it
+    # plays instead.
+    if trembles is not None:
+      trembles = trembles.tolist()
     player_list = [agent1, agent2]
     player_list_id = [agent1.player_id, agent2.player_id]
     history = {}
@@ -135,10 +174,13 @@ class EvolutionaryGame:
       players_payoff[player.player_id] = []
       players_total_payoff.append(0)
 
-    for _ in range(iter_count):
+    for iter in range(iter_count):
       game_action = ()
-      for player in player_list:
+      for player_num in range(len(player_list)):
+        player = player_list[player_num]
         action = player.strategy(player.player_id, player_list_id, history)
+        if trembles is not None and trembles[iter][player_num]:
+          action = actions_list[(actions_list.index(action) + trembles[iter][player_num]) % len(actions_list)]
         game_action += (action, )
 
       for player_num in range(len(player_list)):
@@ -148,6 +190,26 @@ class EvolutionaryGame:
     
     return players_total_payoff
 
+  def draw_trembles(self, pair_count: int):
+    # Draws the execution errors of every move of every match in a game at once. The moves with an
+    # error are found from geometric gaps between them, so only those moves are drawn, and the
+    # result is a compact array of shape (pair_count, iter_count, 2).
+    if self.execution_error == 0 or len(self.actions_list) < 2:
+      return None
+    import numpy as np
+    total = pair_count*self.iter_count*2
+    positions = []
+    last = -1
+    while last < total:
+      gaps = self.rng.geometric(self.execution_error, max(16, int((total - last)*self.execution_error*1.1)))
+      chunk = last + np.cumsum(gaps)
+      positions.append(chunk[chunk < total])
+      last = chunk[-1]
+    positions = np.concatenate(positions)
+    trembles = np.zeros(total, dtype=np.min_scalar_type(len(self.actions_list)))
+    trembles[positions] = self.rng.integers(1, len(self.actions_list), len(positions))
+    return trembles.reshape(pair_count, self.iter_count, 2)
+
   @staticmethod
   def create_match_count(strategy_list):
     match_ups_count = {}
@@ -157,7 +219,9 @@ class EvolutionaryGame:
 
     return match_ups_count
 
-  def simulate(self):
+  def simulate(self, verbose: bool = True):
+    # Number of agents of each strategy in every generation
+    generation_history = []
     for curr_gen in range(self.generations_count):
       match_ups_count = EvolutionaryGame.create_match_count(list(self.strategy_function.keys()))
       for curr_game in range(self.game_count):
@@ -165,14 +229,21 @@ class EvolutionaryGame:
         for pair in match_ups_count.keys():
           match_ups_count[pair].append(0)
 
-        game_pairs = EvolutionaryGame.match_pairs(self.agent_set.fetch_agent_list())
+        game_pairs = EvolutionaryGame.match_pairs(self.agent_set.fetch_agent_list(self.random))
+        trembles = self.draw_trembles(len(game_pairs))
   
-        for pair in game_pairs:
+        for pair_num in range(len(game_pairs)):
+          pair = game_pairs[pair_num]
           strategy_pair = (pair[0].strategy_name, pair[1].strategy_name)
           match_ups_count[strategy_pair][curr_game] += 1
-          payoff_list = EvolutionaryGame.play_game(self.iter_count, pair[0], pair[1], self.payoff_function)
+          pair_trembles = trembles[pair_num] if trembles is not None else None
+          payoff_list = EvolutionaryGame.play_game(self.iter_count, pair[0], pair[1], self.payoff_function, pair_trembles, self.actions_list)
           pair[0].update_game(payoff_list[0])
           pair[1].update_game(payoff_list[1])
 
-      self.agent_set.print_generation_data(curr_gen, match_ups_count)
-      self.agent_set.update_generation()
\ No newline at end of file
+      generation_history.append({strategy: len(agents) for strategy, agents in self.agent_set.agent_set.items()})
+      if verbose:
+        self.agent_set.print_generation_data(curr_gen, match_ups_count)
+      self.agent_set.update_generation(self.mutation_rate, self.rng)
+
+    return generation_history
\ No newline at end of file
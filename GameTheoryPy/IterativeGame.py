@@ -1,6 +1,13 @@
+from __future__ import annotations
 import random
-import numpy as np
-from typing import Callable, Dict, List, Tuple
+from GameTheoryPy.CompactGame import CompactPayoff
+
+# Only type checkers import these. numpy is only needed for the annotations, belief_values are
+# created by the caller.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+  from typing import Callable, Dict, List, Tuple
+  import numpy as np
 
 
 class SimpleIterativeGame:
@@ -123,12 +130,15 @@ class IterativeGame:
   def validate(player_list: List, actions_list: List, payoff_function: Dict[Tuple, List[float]], strategy_function: Dict[str, Callable]):
     n = len(player_list)
     a = len(actions_list)
-    assert len(payoff_function) == a**n
-    for payoff in payoff_function.keys():
-      for action in payoff:
-        assert action in actions_list
-      assert len(payoff) == n
-      assert len(payoff_function[payoff]) == n
+    if isinstance(payoff_function, CompactPayoff):
+      payoff_function.validate(player_list, actions_list)
+    else:
+      assert len(payoff_function) == a**n
+      for payoff in payoff_function.keys():
+        for action in payoff:
+          assert action in actions_list
+        assert len(payoff) == n
+        assert len(payoff_function[payoff]) == n
     assert len(strategy_function) == n
     for strategy in strategy_function.keys():
       assert strategy in player_list
@@ -142,7 +152,7 @@ class IterativeGame:
     print("Total playoff of players: {}".format(players_total_payoff))
     print("-"*100)
   
-  def play_game(self):
+  def create_game_state(self):
     history = {}
     players_payoff = {}
     players_total_payoff = []
@@ -150,6 +160,21 @@ class IterativeGame:
       history[player] = []
       players_payoff[player] = []
       players_total_payoff.append(0)
+    return history, players_payoff, players_total_payoff
+
+  def record_iter(self, iter, game_action, history: Dict[str, List], players_payoff: Dict[str, List], players_total_payoff: List, verbose: bool):
+    # Shared by play_game and play_game_async once the actions of all the players are known
+    iter_payoff = self.payoff_function[game_action]
+    for player_num in range(len(self.player_list)):
+      history[self.player_list[player_num]].append(game_action[player_num])
+      players_payoff[self.player_list[player_num]].append(iter_payoff[player_num])
+      players_total_payoff[player_num] += iter_payoff[player_num]
+
+    if verbose:
+      self.print_iter(iter, game_action, players_total_payoff)
+
+  def play_game(self, verbose: bool = True):
+    history, players_payoff, players_total_payoff = self.create_game_state()
 
     for iter in range(self.iter_count):
       game_action = ()
@@ -157,11 +182,40 @@ class IterativeGame:
         action = self.strategy_function[player](player, self.player_list, history)
         game_action += (action, )
 
-      for player_num in range(len(self.player_list)):
-        history[self.player_list[player_num]].append(game_action[player_num])
-        players_payoff[self.player_list[player_num]].append(self.payoff_function[game_action][player_num])
-        players_total_payoff[player_num] += self.payoff_function[game_action][player_num]
-      
-      self.print_iter(iter, game_action, players_total_payoff)
+      self.record_iter(iter, game_action, history, players_payoff, players_total_payoff, verbose)
+
+    return players_total_payoff
 
-    
\ No newline at end of file
+    
+  async def get_action_async(self, player, history: Dict[str, List], timeout: float, default_action):
+    # Strategies may be plain functions or coroutine functions, only the latter can time out.
+    import asyncio
+    import inspect
+    action = self.strategy_function[player](player, self.player_list, history)
+    if inspect.isawaitable(action):
+      try:
+        action = await asyncio.wait_for(action, timeout)
+      except asyncio.TimeoutError:
+        action = default_action
+    return action
+
+  async def play_game_async(self, timeout: float = None, default_action = None, verbose: bool = True):
+    import asyncio
+    if default_action is None:
+      default_action = self.actions_list[0]
+    assert default_action in self.actions_list
+
+    history, players_payoff, players_total_payoff = self.create_game_state()
+
+    for iter in range(self.iter_count):
+      # All the players choose their action for the round concurrently
+      game_action = tuple(await asyncio.gather(*[self.get_action_async(player, history, timeout, default_action) for player in self.player_list]))
+
+      self.record_iter(iter, game_action, history, players_payoff, players_total_payoff, verbose)
+
+    return players_total_payoff
+
+  @staticmethod
+  async def play_games_async(games: List[IterativeGame], timeout: float = None, default_action = None, verbose: bool = False):
+    import asyncio
+    return await asyncio.gather(*[game.play_game_async(timeout, default_action, verbose) for game in games])
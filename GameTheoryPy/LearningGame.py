@@ -0,0 +1,144 @@
+import itertools
+import string
+import numpy as np
+from typing import Dict, List, Tuple, Union
+from GameTheoryPy.SimpleGame import SimpleGame
+from GameTheoryPy.CorrelatedEquilibrium import check_full_payoff_function, get_payoff_tensor
+
+
+class LearningGame:
+  # Runs no-regret learning dynamics where every player updates a mixed strategy each round from
+  # the payoff of each of its actions against the current strategies of the others. The average
+  # joint play converges to a coarse correlated equilibrium. payoff_function can be a list of
+  # payoff functions to learn that many games at once. The payoffs are held as a full tensor, so
+  # compact payoff functions are rejected.
+
+  RULES = ["regret_matching", "regret_matching_plus", "hedge"]
+
+  def __init__(self, player_list: List, actions_list: List, payoff_function: Union[Dict[Tuple, List[float]], List[Dict[Tuple, List[float]]]], rule: str, iter_count: int, learning_rate: float = None):
+    self.batched = isinstance(payoff_function, list)
+    payoff_function_list = payoff_function if self.batched else [payoff_function]
+    LearningGame.validate(player_list, actions_list, payoff_function_list, rule)
+    self.player_list = player_list
+    self.actions_list = actions_list
+    self.payoff_function = payoff_function
+    self.rule = rule
+    self.iter_count = iter_count
+
+    n = len(player_list)
+    a = len(actions_list)
+    # payoff_tensor[g, i] is the payoff tensor of player i in game g
+    self.payoff_tensor = np.stack([get_payoff_tensor(player_list, actions_list, pf) for pf in payoff_function_list])
+    game_count = self.payoff_tensor.shape[0]
+
+    if learning_rate is None:
+      # Standard rate for Hedge over iter_count rounds, scaled by the payoff range of each game
+      payoff_range = np.ptp(self.payoff_tensor.reshape(game_count, -1), axis=1)
+      payoff_range[payoff_range == 0] = 1
+      learning_rate = np.sqrt(8*np.log(max(a, 2))/max(iter_count, 1))/payoff_range
+    self.learning_rate = np.broadcast_to(np.asarray(learning_rate, dtype=float), (game_count, )).reshape(game_count, 1, 1)
+
+    letters = string.ascii_letters[:n]
+    # Contracts the payoff tensor of player i with the strategies of all the other players
+    self.counterfactual_subscripts = []
+    for i in range(n):
+      operands = ["Z" + letters] + ["Z" + letters[j] for j in range(n) if j != i]
+      self.counterfactual_subscripts.append(",".join(operands) + "->Z" + letters[i])
+
+    self.strategies = np.full((game_count, n, a), 1/a)
+    self.cumulative_regret = np.zeros((game_count, n, a))
+    self.cumulative_payoff = np.zeros((game_count, n, a))
+    # Unclipped external regret, used for the equilibrium gap whatever the rule
+    self.external_regret = np.zeros((game_count, n, a))
+    self.strategy_sum = np.zeros((game_count, n, a))
+    self.distribution_sum = np.zeros((game_count, a**n))
+    self.iter_played = 0
+
+  @staticmethod
+  def validate(player_list: List, actions_list: List, payoff_function_list: List[Dict[Tuple, List[float]]], rule: str):
+    assert len(payoff_function_list) > 0
+    for payoff_function in payoff_function_list:
+      check_full_payoff_function(player_list, actions_list, payoff_function)
+      SimpleGame.validate(player_list, actions_list, payoff_function)
+    assert rule in LearningGame.RULES
+    assert len(player_list) <= 26
+
+  def get_counterfactual_payoffs(self):
+    # counterfactual_payoffs[g, i, k] is the expected payoff of player i for playing action k
+    n = len(self.player_list)
+    counterfactual_payoffs = np.empty(self.strategies.shape)
+    for i in range(n):
+      other_strategies = [self.strategies[:, j] for j in range(n) if j != i]
+      counterfactual_payoffs[:, i] = np.einsum(self.counterfactual_subscripts[i], self.payoff_tensor[:, i], *other_strategies)
+    return counterfactual_payoffs
+
+  def get_joint_distribution(self):
+    game_count = self.strategies.shape[0]
+    distribution = self.strategies[:, 0]
+    for j in range(1, len(self.player_list)):
+      distribution = (distribution[:, :, None]*self.strategies[:, j][:, None, :]).reshape(game_count, -1)
+    return distribution
+
+  @staticmethod
+  def get_positive_part_strategy(regret: np.ndarray):
+    positive_regret = np.maximum(regret, 0)
+    total = positive_regret.sum(axis=-1, keepdims=True)
+    uniform = np.full(regret.shape, 1/regret.shape[-1])
+    return np.where(total > 0, positive_regret/np.where(total > 0, total, 1), uniform)
+
+  def update_strategies(self):
+    counterfactual_payoffs = self.get_counterfactual_payoffs()
+    expected_payoffs = (counterfactual_payoffs*self.strategies).sum(axis=-1, keepdims=True)
+
+    self.strategy_sum += self.strategies
+    self.distribution_sum += self.get_joint_distribution()
+    self.external_regret += counterfactual_payoffs - expected_payoffs
+    self.iter_played += 1
+
+    # All the players move to their new strategies simultaneously
+    if self.rule == "regret_matching":
+      self.cumulative_regret += counterfactual_payoffs - expected_payoffs
+      self.strategies = LearningGame.get_positive_part_strategy(self.cumulative_regret)
+    elif self.rule == "regret_matching_plus":
+      self.cumulative_regret = np.maximum(self.cumulative_regret + counterfactual_payoffs - expected_payoffs, 0)
+      self.strategies = LearningGame.get_positive_part_strategy(self.cumulative_regret)
+    else:
+      self.cumulative_payoff += counterfactual_payoffs
+      scores = self.learning_rate*self.cumulative_payoff
+      scores -= scores.max(axis=-1, keepdims=True)
+      weights = np.exp(scores)
+      self.strategies = weights/weights.sum(axis=-1, keepdims=True)
+
+  def get_average_strategies(self):
+    average_strategies = self.strategy_sum/max(self.iter_played, 1)
+    result = []
+    for g in range(average_strategies.shape[0]):
+      result.append({self.player_list[i]: [float(prob) for prob in average_strategies[g, i]] for i in range(len(self.player_list))})
+    return result if self.batched else result[0]
+
+  def get_average_distribution(self):
+    average_distribution = self.distribution_sum/max(self.iter_played, 1)
+    strategy_list = list(itertools.product(self.actions_list, repeat=len(self.player_list)))
+    result = []
+    for g in range(average_distribution.shape[0]):
+      result.append({strategy_list[k]: float(prob) for k, prob in enumerate(average_distribution[g]) if prob > 1e-9})
+    return result if self.batched else result[0]
+
+  def get_equilibrium_gap(self):
+    # The largest gain any player gets from always playing one action against the average joint
+    # play, which is at most 0 exactly when the average is a coarse correlated equilibrium.
+    gap = self.external_regret.max(axis=(1, 2))/max(self.iter_played, 1)
+    return [float(value) for value in gap] if self.batched else float(gap[0])
+
+  def print_game(self):
+    print("-"*100)
+    print("Iterations: {}".format(self.iter_played))
+    print("Average strategies of players: {}".format(self.get_average_strategies()))
+    print("Average joint play: {}".format(self.get_average_distribution()))
+    print("Coarse correlated equilibrium gap: {}".format(self.get_equilibrium_gap()))
+    print("-"*100)
+
+  def play_game(self):
+    for _ in range(self.iter_count):
+      self.update_strategies()
+    self.print_game()
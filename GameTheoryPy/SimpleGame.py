@@ -1,4 +1,12 @@
-from typing import Dict, List, Tuple
+from __future__ import annotations
+from GameTheoryPy.CompactGame import CompactPayoff
+
+# typing costs more to import than the rest of the SimpleGame path, and the annotations are never
+# evaluated, so it is only imported by type checkers. Type checkers treat a module level
+# TYPE_CHECKING constant like typing.TYPE_CHECKING.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+  from typing import Dict, List, Tuple
 
 
 class SimpleGame:
@@ -6,12 +14,20 @@ class SimpleGame:
   def __init__(self, player_list: List, actions_list: List, payoff_function: Dict[Tuple, List[float]]):
     self.player_list = player_list
     self.actions_list = actions_list
-    self.payoff_function = payoff_function
+    # update_payoff changes the payoffs, so the caller's dict is copied rather than edited in place.
+    self.payoff_function = payoff_function if isinstance(payoff_function, CompactPayoff) else dict(payoff_function)
     SimpleGame.validate(self.player_list, self.actions_list, self.payoff_function)
+    # Per-player best responses keyed by the scenario of the other players, kept between calls
+    # so that update_payoff can patch the equilibrium set instead of recomputing it.
+    self.best_responses = None
+    self.nash_states = None
 
 
   @staticmethod
   def validate(player_list: List, actions_list: List, payoff_function: Dict[Tuple, List[float]]):
+    if isinstance(payoff_function, CompactPayoff):
+      payoff_function.validate(player_list, actions_list)
+      return
     n = len(player_list)
     a = len(actions_list)
     assert len(payoff_function) == a**n
@@ -21,6 +37,11 @@ class SimpleGame:
       assert len(strategy) == n
       assert len(payoff_function[strategy]) == n
 
+  def get_payoff(self, strategy: Tuple, player_index: int):
+    if isinstance(self.payoff_function, CompactPayoff):
+      return self.payoff_function.get_payoff(strategy, player_index)
+    return self.payoff_function[strategy][player_index]
+
   def calculate_best_response(self, scenario: List, player_index: int):
     # scenario is the list of actions by other players in order
     # scenario -> list of size n-1, n is the number of players
@@ -33,14 +54,33 @@ class SimpleGame:
     for k in range(1, len(self.actions_list)):
       strategy = scenario.copy()
       strategy.insert(player_index, self.actions_list[k])
-      if(self.payoff_function[tuple(strategy)][player_index] == self.payoff_function[best_response[0]][player_index]):
+      if(self.get_payoff(tuple(strategy), player_index) == self.get_payoff(best_response[0], player_index)):
         best_response.append(tuple(strategy))
-      elif (self.payoff_function[tuple(strategy)][player_index] > self.payoff_function[best_response[0]][player_index]):
+      elif (self.get_payoff(tuple(strategy), player_index) > self.get_payoff(best_response[0], player_index)):
         best_response = [tuple(strategy)]
 
     return best_response
 
+  @staticmethod
+  def get_scenario(strategy: Tuple, player_index: int):
+    return strategy[:player_index] + strategy[player_index+1:]
+
+  def is_nash_state(self, strategy: Tuple):
+    for i in range(len(self.player_list)):
+      scenario = SimpleGame.get_scenario(strategy, i)
+      if strategy not in self.best_responses[self.player_list[i]][scenario]:
+        return False
+    return True
+
   def calculate_nash_states(self):
+    # Returns the list of pure Nash states. With a SymmetricPayoff only one Nash state is returned
+    # for each count of players on each action, with the players taking the actions in
+    # actions_list order, since listing every permutation would be exponential in the players.
+    # Every permutation of a returned state is also a Nash state.
+    if isinstance(self.payoff_function, CompactPayoff):
+      # Compact games search the equilibria on their own representation.
+      return self.payoff_function.calculate_nash_states()
+
     n = len(self.player_list)
     a = len(self.actions_list)
     best_responses = {}
@@ -49,20 +89,58 @@ class SimpleGame:
 
     # For each player
     for i in range(len(self.player_list)):
-      best_response_list = []
+      best_response_index = {}
 
       # For each scenario -> a^(n-1) possible scenarios for each player
       for j in range(a**(n-1)):
         scenario = list(strategy_list[j][1:])
-        best_response_list.extend(self.calculate_best_response(scenario, i))
+        best_response_index[tuple(scenario)] = set(self.calculate_best_response(scenario, i))
 
-      best_responses[self.player_list[i]] = best_response_list
+      best_responses[self.player_list[i]] = best_response_index
 
     # Find the common set of best_reponses to find the nash equilibrium
-    nash_states = set()
-    for resp in best_responses.values():
-      if len(nash_states) == 0:
-        nash_states = set(resp)
+    nash_states = None
+    for best_response_index in best_responses.values():
+      resp = set().union(*best_response_index.values())
+      if nash_states is None:
+        nash_states = resp
       else:
-        nash_states &= set(resp)
+        nash_states &= resp
+
+    self.best_responses = best_responses
+    self.nash_states = nash_states
     return list(nash_states)
+
+  def calculate_correlated_equilibrium(self, objective="welfare", coarse: bool = False):
+    # Returns a distribution over the strategies as a dict. objective is "welfare", a player or a
+    # dict of weights for each strategy, and coarse gives a coarse correlated equilibrium instead.
+    # The linear program is over all a^n strategies, so compact payoff functions are rejected.
+    from GameTheoryPy.CorrelatedEquilibrium import calculate_correlated_equilibrium
+    return calculate_correlated_equilibrium(self.player_list, self.actions_list, self.payoff_function, objective, coarse)
+
+  def update_payoff(self, strategy: Tuple, values: List[float]):
+    assert not isinstance(self.payoff_function, CompactPayoff)
+    strategy = tuple(strategy)
+    assert strategy in self.payoff_function
+    assert len(values) == len(self.player_list)
+    self.payoff_function[strategy] = list(values)
+
+    if self.best_responses is None:
+      return self.calculate_nash_states()
+
+    # Only the scenario of each player that contains the changed strategy can have a different
+    # best response, so only the states in the old and new best responses need to be rechecked.
+    affected_states = set()
+    for i in range(len(self.player_list)):
+      scenario = SimpleGame.get_scenario(strategy, i)
+      best_response_index = self.best_responses[self.player_list[i]]
+      affected_states |= best_response_index[scenario]
+      best_response_index[scenario] = set(self.calculate_best_response(list(scenario), i))
+      affected_states |= best_response_index[scenario]
+
+    for state in affected_states:
+      if self.is_nash_state(state):
+        self.nash_states.add(state)
+      else:
+        self.nash_states.discard(state)
+    return list(self.nash_states)
@@ -0,0 +1,52 @@
+import sys
+
+# The submodules are only imported when one of their names is first used, so importing the package
+# to solve a SimpleGame does not pay for numpy, asyncio or the other games.
+#
+# The game classes are not exported from the package. Each one has the name of the submodule it is
+# in, and `from GameTheoryPy.SimpleGame import SimpleGame` has always been the way to import them.
+# Any import of a submodule binds its name on the package, so a class exported under the same name
+# would be replaced by the module as soon as anything imported the submodule. The package names
+# GameTheoryPy.SimpleGame, GameTheoryPy.IterativeGame, GameTheoryPy.EvolutionaryGame and
+# GameTheoryPy.LearningGame are therefore always the submodules. Names that do not clash with a
+# submodule are exported lazily below.
+_submodules = [
+  "SimpleGame",
+  "IterativeGame",
+  "EvolutionaryGame",
+  "CompactGame",
+  "CorrelatedEquilibrium",
+  "LearningGame",
+  "BatchSolver",
+]
+
+_exports = {
+  "SimpleIterativeGame": "IterativeGame",
+  "Agent": "EvolutionaryGame",
+  "AgentSet": "EvolutionaryGame",
+  "CompactPayoff": "CompactGame",
+  "SymmetricPayoff": "CompactGame",
+  "PolymatrixPayoff": "CompactGame",
+  "GraphicalPayoff": "CompactGame",
+  "calculate_correlated_equilibrium": "CorrelatedEquilibrium",
+}
+
+__all__ = _submodules + list(_exports.keys())
+
+
+def __getattr__(name):
+  if name in _submodules:
+    module_name = "{}.{}".format(__name__, name)
+    __import__(module_name)
+    return sys.modules[module_name]
+  if name in _exports:
+    module_name = "{}.{}".format(__name__, _exports[name])
+    __import__(module_name)
+    value = getattr(sys.modules[module_name], name)
+    globals()[name] = value
+    return value
+  raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+  return sorted(set(globals().keys()) | set(__all__))
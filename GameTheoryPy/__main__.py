@@ -0,0 +1,5 @@
+from GameTheoryPy.BatchSolver import main
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,55 @@
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+
+
+# Each sample runs in a fresh interpreter so nothing is cached in sys.modules.
+SAMPLE_CODE = """
+import time
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start)
+"""
+
+IMPORTS = {
+  "SimpleGame": "from GameTheoryPy.SimpleGame import SimpleGame",
+  "SimpleGame solve": "from GameTheoryPy.SimpleGame import SimpleGame\nSimpleGame(['A', 'B'], [0, 1], {(0,0): [1,1], (0,1): [0,2], (1,0): [2,0], (1,1): [1,1]}).calculate_nash_states()",
+  "IterativeGame": "from GameTheoryPy.IterativeGame import IterativeGame",
+  "EvolutionaryGame": "from GameTheoryPy.EvolutionaryGame import EvolutionaryGame",
+  "LearningGame": "from GameTheoryPy.LearningGame import LearningGame",
+}
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(code, runs):
+  samples = []
+  for _ in range(runs):
+    output = subprocess.run([sys.executable, "-c", SAMPLE_CODE.format(code)], cwd=ROOT, capture_output=True, text=True, check=True)
+    samples.append(float(output.stdout.strip())*1000)
+  return statistics.median(samples)
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Cold start import time of GameTheoryPy.")
+  parser.add_argument("--runs", type=int, default=20)
+  # Importing typing alone takes longer than this, so the default catches it coming back.
+  parser.add_argument("--max-ms", type=float, default=15, help="Fail if the SimpleGame import takes longer than this, 0 to disable.")
+  args = parser.parse_args()
+
+  # Compile the bytecode first so the samples measure importing and not compiling, also when
+  # PYTHONDONTWRITEBYTECODE is set.
+  compileall.compile_dir(os.path.join(ROOT, "GameTheoryPy"), quiet=1)
+
+  results = {}
+  for name, code in IMPORTS.items():
+    results[name] = measure(code, args.runs)
+    print("{:<20} {:8.2f} ms".format(name, results[name]))
+
+  if args.max_ms and results["SimpleGame"] > args.max_ms:
+    print("SimpleGame import took {:.2f} ms, more than {:.2f} ms".format(results["SimpleGame"], args.max_ms))
+    sys.exit(1)
@@ -1,8 +1,12 @@
+import asyncio
+import itertools
 import random
 from typing import Dict, List
 from GameTheoryPy.SimpleGame import SimpleGame
 from GameTheoryPy.IterativeGame import IterativeGame, SimpleIterativeGame
 from GameTheoryPy.EvolutionaryGame import EvolutionaryGame
+from GameTheoryPy.LearningGame import LearningGame
+from GameTheoryPy.CompactGame import SymmetricPayoff, PolymatrixPayoff
 import numpy as np
 
 def game1():
@@ -64,6 +68,77 @@ def game3():
   print(game.calculate_nash_states())
 
 
+def game3_update():
+  """Prisoners' dilemma where the payoff of mutual cooperation is raised after solving."""
+  agents = ["A", "B"]
+  actions = ["Cooperate", "Defect"]
+  payoff_function = {
+    ("Cooperate", "Cooperate"): [6,6],
+    ("Cooperate", "Defect"): [0,10],
+    ("Defect", "Cooperate"): [10,0],
+    ("Defect", "Defect"): [1,1]
+  }
+
+  game = SimpleGame(agents, actions, payoff_function)
+  print("The nash equilibrium states are:")
+  print(game.calculate_nash_states())
+  print("The nash equilibrium states after the update are:")
+  print(game.update_payoff(("Cooperate", "Cooperate"), [12,12]))
+
+
+def chicken_correlated_game():
+  """Game of chicken, where a correlated equilibrium gives a higher welfare than the nash states."""
+  agents = ["A", "B"]
+  actions = ["Dare", "Chicken"]
+  payoff_function = {
+    ("Dare", "Dare"): [0,0],
+    ("Dare", "Chicken"): [7,2],
+    ("Chicken", "Dare"): [2,7],
+    ("Chicken", "Chicken"): [6,6]
+  }
+
+  game = SimpleGame(agents, actions, payoff_function)
+  print("The nash equilibrium states are:")
+  print(game.calculate_nash_states())
+  print("The correlated equilibrium with the highest welfare is:")
+  print(game.calculate_correlated_equilibrium())
+  print("The coarse correlated equilibrium with the highest welfare is:")
+  print(game.calculate_correlated_equilibrium(coarse=True))
+
+
+def public_goods_game():
+  """A symmetric public goods game with 30 agents stored by action counts."""
+  agents = ["A{}".format(i) for i in range(30)]
+  actions = ["Contribute", "Free ride"]
+  payoff_function = {}
+  for counts in SymmetricPayoff.count_vectors(len(agents)-1, len(actions)):
+    # Every contribution costs 1 to the contributor and is shared equally as 2 among all agents
+    payoff_function[("Contribute", counts)] = 2*(counts[0]+1)/len(agents) - 1
+    payoff_function[("Free ride", counts)] = 2*counts[0]/len(agents)
+
+  game = SimpleGame(agents, actions, SymmetricPayoff(agents, actions, payoff_function))
+  print("The nash equilibrium states are:")
+  print(game.calculate_nash_states())
+
+
+def coordination_ring_game():
+  """A polymatrix game where each of 30 agents coordinates with its neighbour in a ring."""
+  agents = ["A{}".format(i) for i in range(30)]
+  actions = ["Left", "Right"]
+  payoff_function = {}
+  for i in range(len(agents)):
+    payoff_function[(agents[i], agents[(i+1) % len(agents)])] = {
+      ("Left", "Left"): 1,
+      ("Left", "Right"): 0,
+      ("Right", "Left"): 0,
+      ("Right", "Right"): 2
+    }
+
+  game = SimpleGame(agents, actions, PolymatrixPayoff(agents, actions, payoff_function))
+  print("The nash equilibrium states are:")
+  print(game.calculate_nash_states())
+
+
 def game4():
   """Prisoners' dilemma with neutral trust."""
   agents = ["A", "B"]
@@ -176,6 +251,40 @@ def game8():
   game.play_game()
 
 
+def SHH_regret_matching():
+  """ Stag Hare Hunt where both players learn with regret matching."""
+  agents = ["A", "B"]
+  actions = ["Stag", "Hare"]
+  payoff_function = {
+    ("Stag", "Stag"): [3,3],
+    ("Stag", "Hare"): [0,2],
+    ("Hare", "Stag"): [2,0],
+    ("Hare", "Hare"): [2,2]
+  }
+  iter_count = 1000
+
+  game = LearningGame(agents, actions, payoff_function, "regret_matching", iter_count)
+  game.play_game()
+
+
+def random_games_hedge():
+  """ 100 random three player games learned at once with multiplicative weights."""
+  agents = ["A", "B", "C"]
+  actions = [0, 1, 2]
+  payoff_functions = []
+  for _ in range(100):
+    payoff_function = {}
+    for strategy in itertools.product(actions, repeat=len(agents)):
+      payoff_function[strategy] = [random.randint(0, 10) for _ in agents]
+    payoff_functions.append(payoff_function)
+  iter_count = 1000
+
+  game = LearningGame(agents, actions, payoff_functions, "hedge", iter_count)
+  for _ in range(iter_count):
+    game.update_strategies()
+  print("Largest coarse correlated equilibrium gap: {}".format(max(game.get_equilibrium_gap())))
+
+
 def IPD_tit_vs_alld():
   """This is a Iterated Prisoners' Dilemma game between TIT FOR TAT and ALL D strategy."""
   def tit_for_tat(player: str, player_list: List, history: Dict[str, List]):
@@ -207,6 +316,40 @@ def IPD_tit_vs_alld():
   game.play_game()
 
 
+def IPD_async_tit_vs_alld():
+  """Many Iterated Prisoners' Dilemma games where TIT FOR TAT waits on a slow scoring service."""
+  async def scoring_service(history: List):
+    # Stand-in for a call to an external service
+    await asyncio.sleep(random.uniform(0, 0.02))
+    return history[-1] if history else "Cooperate"
+
+  async def tit_for_tat(player: str, player_list: List, history: Dict[str, List]):
+    opponent_player_list = [i for i in player_list if i != player]
+    return await scoring_service(history[opponent_player_list[0]])
+
+  def all_d(player: str, player_list: List, history: Dict[str, List]):
+    return "Defect"
+
+  agents = ["A", "B"]
+  actions = ["Cooperate", "Defect"]
+  payoff_function = {
+    ("Cooperate", "Cooperate"): [6,6],
+    ("Cooperate", "Defect"): [0,10],
+    ("Defect", "Cooperate"): [10,0],
+    ("Defect", "Defect"): [1,1]
+  }
+  iter_count = 10
+  strategy_function = {
+    "A": tit_for_tat,
+    "B": all_d,
+  }
+  games = [IterativeGame(agents, actions, payoff_function, strategy_function, iter_count) for _ in range(100)]
+  # Moves that take longer than 15ms fall back to defecting
+  results = asyncio.run(IterativeGame.play_games_async(games, timeout=0.015, default_action="Defect"))
+  print("Total payoffs of the players in each game:")
+  print(results)
+
+
 def IPD_tftt_vs_alld():
   """This is a Iterated Prisoners' Dilemma game between TIT FOR TAT and ALL D strategy."""
   def tit_for_two_tat(player: str, player_list: List, history: Dict[str, List]):
@@ -399,18 +542,72 @@ def IPD_bounded_tft_vs_ttft_evolutionary_game():
   game.simulate()
 
 
+def IPD_noisy_tft_vs_ttft_evolutionary_game():
+  """TIT FOR TAT against TIT FOR TWO TAT when moves are played by mistake and agents mutate."""
+  def tit_for_tat(player: str, player_list: List, history: Dict[str, List]):
+    assert len(history.keys()) == 2
+    
+    if len(history[player]) == 0:
+      return "Cooperate"
+    else:
+      opponent_player_list = [i for i in player_list if i != player]
+      return history[opponent_player_list[0]][-1]
+
+  def tit_for_two_tat(player: str, player_list: List, history: Dict[str, List]):
+    assert len(history.keys()) == 2
+    
+    if len(history[player]) < 2:
+      return "Cooperate"
+    else:
+      opponent_player = [i for i in player_list if i != player][0]
+      if history[opponent_player][-1] == "Defect" and history[opponent_player][-2] == "Defect":
+        return "Defect"
+      return "Cooperate"
+
+  generations_count = 30
+  game_count = 20
+  iter_count = 200
+  strategy_function = {
+    "tit_for_tat": tit_for_tat,
+    "tit_for_two_tat": tit_for_two_tat
+  }
+  payoff_function = {
+    ("Cooperate", "Cooperate"): [6,6],
+    ("Cooperate", "Defect"): [0,10],
+    ("Defect", "Cooperate"): [10,0],
+    ("Defect", "Defect"): [1,1]
+  }
+  agent_distribution = {
+    "tit_for_tat": 50,
+    "tit_for_two_tat": 50
+  }
+  # 5% of the moves are mistakes and 1% of the agents switch strategy every generation
+  execution_error = 0.05
+  mutation_rate = 0.01
+  game = EvolutionaryGame(generations_count, game_count, iter_count, strategy_function, agent_distribution, payoff_function, execution_error, mutation_rate)
+  game.simulate()
+
+
 
 if __name__ == "__main__":
   # game1()
   # game2()
   # game3()
+  # game3_update()
+  # chicken_correlated_game()
+  # public_goods_game()
+  # coordination_ring_game()
   # game4()
   # game5()
   # game6()
   # game7()
+  # SHH_regret_matching()
+  # random_games_hedge()
   # IPD_tit_vs_alld()
+  # IPD_async_tit_vs_alld()
   # IPD_tftt_vs_alld()
   # SHH_tit_vs_allH()
   # IPD_tft_vs_alld_evolutionary_game()
   # IPD_tft_vs_alld_vs_ttft_evolutionary_game()
-  IPD_bounded_tft_vs_ttft_evolutionary_game()
\ No newline at end of file
+  IPD_bounded_tft_vs_ttft_evolutionary_game()
+  # IPD_noisy_tft_vs_ttft_evolutionary_game()
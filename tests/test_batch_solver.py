@@ -0,0 +1,79 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import pytest
+from GameTheoryPy import BatchSolver
+from GameTheoryPy.BatchSolver import read_jsonl, read_records, solve_records
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_games(path, count, seed=0):
+  rng = random.Random(seed)
+  with open(path, "w") as f:
+    for i in range(count):
+      payoff_function = [[[a, b], [rng.randint(0, 5), rng.randint(0, 5)]] for a in range(2) for b in range(2)]
+      f.write(json.dumps({"id": i, "players": ["A", "B"], "actions": [0, 1], "payoff_function": payoff_function}) + "\n")
+
+
+def run_cli(args, **kwargs):
+  return subprocess.Popen([sys.executable, "-m", "GameTheoryPy"] + args, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+
+
+def test_workers_keep_the_input_order(tmp_path):
+  path = str(tmp_path/"games.jsonl")
+  write_games(path, 500)
+  serial = list(solve_records(read_jsonl(path), 1, 8))
+  parallel = list(solve_records(read_jsonl(path), 2, 8))
+  assert parallel == serial
+  assert [result["id"] for result in serial] == list(range(500))
+
+
+def test_malformed_lines_become_error_results(tmp_path):
+  path = tmp_path/"games.jsonl"
+  path.write_text('{"id": 1, "players": ["A"], "actions": [0], "payoff_function": [[[0], [1]]]}\nnot json\n[1, 2]\n')
+  results = list(solve_records(read_jsonl(str(path)), 1, 8))
+  assert results[0] == {"id": 1, "nash_states": [[0]]}
+  assert results[1]["line"] == 2 and "error" in results[1]
+  assert results[2]["line"] == 3 and "error" in results[2]
+
+
+def test_cli_exits_when_the_output_is_closed(tmp_path):
+  path = str(tmp_path/"games.jsonl")
+  write_games(path, 5000)
+  for workers in ["1", "2"]:
+    process = run_cli([path, "-w", workers, "--chunk-size", "4"])
+    assert json.loads(process.stdout.readline())["id"] == 0
+    process.stdout.close()
+    # Used to hang with workers when the pool waited for its feeder thread
+    assert process.wait(timeout=60) != 0
+    assert b"Traceback" not in process.stderr.read()
+    process.stderr.close()
+
+
+def test_npz_and_npy_match_jsonl(tmp_path):
+  np = pytest.importorskip("numpy")
+  payoff_tensor = np.random.default_rng(0).integers(0, 5, size=(50, 3, 3, 2)).astype(float)
+  jsonl_path = tmp_path/"games.jsonl"
+  with open(jsonl_path, "w") as f:
+    for g in range(len(payoff_tensor)):
+      f.write(json.dumps({"id": g, "players": [0, 1], "actions": [0, 1, 2], "payoff_tensor": payoff_tensor[g].tolist()}) + "\n")
+  np.savez(tmp_path/"games.npz", payoff_tensor=payoff_tensor)
+  np.savez_compressed(tmp_path/"compressed.npz", payoff_tensor=payoff_tensor)
+  np.save(tmp_path/"games.npy", payoff_tensor)
+  expected = list(solve_records(read_records([str(jsonl_path)], "simple"), 1, 8))
+  for name in ["games.npz", "compressed.npz", "games.npy"]:
+    assert list(solve_records(read_records([str(tmp_path/name)], "simple"), 1, 8)) == expected
+
+
+def test_npy_is_read_in_batches(tmp_path, monkeypatch):
+  np = pytest.importorskip("numpy")
+  monkeypatch.setattr(BatchSolver, "NPZ_BATCH_SIZE", 7)
+  payoff_tensor = np.arange(20*2*2*2, dtype=float).reshape(20, 2, 2, 2)
+  np.save(tmp_path/"games.npy", payoff_tensor)
+  records = list(BatchSolver.read_npz(str(tmp_path/"games.npy"), "simple"))
+  assert [record["id"] for record in records] == list(range(20))
+  for g, record in enumerate(records):
+    assert (record["payoff_tensor"] == payoff_tensor[g]).all()
@@ -0,0 +1,53 @@
+import itertools
+import random
+import pytest
+from GameTheoryPy.SimpleGame import SimpleGame
+from GameTheoryPy.CompactGame import CompactPayoff, SymmetricPayoff, PolymatrixPayoff, GraphicalPayoff
+
+
+def full_payoff_function(compact_payoff, player_list, actions_list):
+  return {strategy: compact_payoff[strategy] for strategy in itertools.product(actions_list, repeat=len(player_list))}
+
+
+def test_compact_payoff_is_abstract():
+  with pytest.raises(TypeError):
+    CompactPayoff(["A", "B"], [0, 1])
+
+
+def test_polymatrix_nash_states_match_full_table():
+  rng = random.Random(0)
+  player_list = ["A", "B", "C", "D"]
+  actions_list = [0, 1]
+  payoff_function = {}
+  for p, q in itertools.permutations(player_list, 2):
+    payoff_function[(p, q)] = {key: rng.randint(0, 4) for key in itertools.product(actions_list, repeat=2)}
+  compact_payoff = PolymatrixPayoff(player_list, actions_list, payoff_function)
+  compact_states = SimpleGame(player_list, actions_list, compact_payoff).calculate_nash_states()
+  full_states = SimpleGame(player_list, actions_list, full_payoff_function(compact_payoff, player_list, actions_list)).calculate_nash_states()
+  assert set(compact_states) == set(full_states)
+
+
+def test_graphical_nash_states_match_full_table():
+  rng = random.Random(1)
+  player_list = ["A", "B", "C", "D"]
+  actions_list = [0, 1]
+  neighbour_list = {"A": ["B"], "B": ["C"], "C": ["D"], "D": ["A"]}
+  payoff_function = {p: {key: rng.randint(0, 4) for key in itertools.product(actions_list, repeat=2)} for p in player_list}
+  compact_payoff = GraphicalPayoff(player_list, actions_list, neighbour_list, payoff_function)
+  compact_states = SimpleGame(player_list, actions_list, compact_payoff).calculate_nash_states()
+  full_states = SimpleGame(player_list, actions_list, full_payoff_function(compact_payoff, player_list, actions_list)).calculate_nash_states()
+  assert set(compact_states) == set(full_states)
+
+
+def test_symmetric_nash_states_are_one_per_count_vector():
+  player_list = ["A", "B", "C", "D"]
+  actions_list = ["Contribute", "Free ride"]
+  payoff_function = {}
+  for counts in SymmetricPayoff.count_vectors(len(player_list)-1, len(actions_list)):
+    payoff_function[("Contribute", counts)] = 2*(counts[0]+1)/len(player_list) - 1
+    payoff_function[("Free ride", counts)] = 2*counts[0]/len(player_list)
+  compact_payoff = SymmetricPayoff(player_list, actions_list, payoff_function)
+  compact_states = SimpleGame(player_list, actions_list, compact_payoff).calculate_nash_states()
+  full_states = SimpleGame(player_list, actions_list, full_payoff_function(compact_payoff, player_list, actions_list)).calculate_nash_states()
+  assert {tuple(sorted(state)) for state in full_states} == {tuple(sorted(state)) for state in compact_states}
+  assert len(compact_states) == len({tuple(sorted(state)) for state in compact_states})
@@ -0,0 +1,82 @@
+import itertools
+import sys
+import numpy as np
+import pytest
+from GameTheoryPy.SimpleGame import SimpleGame
+from GameTheoryPy import CorrelatedEquilibrium
+from GameTheoryPy.CorrelatedEquilibrium import get_ce_constraints, get_cce_constraints, simplex
+
+FEASIBILITY_TOLERANCE = 1e-9
+OPTIMUM_TOLERANCE = 1e-6
+
+SHAPES = [(8, 8), (12, 12), (20, 20), (4, 4, 4)]
+
+
+def random_payoff_tensor(shape, seed):
+  return np.random.default_rng(seed).normal(size=(len(shape), ) + shape)
+
+
+def get_constraints(payoff_tensor, coarse):
+  return get_cce_constraints(payoff_tensor) if coarse else get_ce_constraints(payoff_tensor)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("coarse", [False, True])
+def test_simplex_is_feasible(shape, coarse):
+  for seed in range(3):
+    payoff_tensor = random_payoff_tensor(shape, seed)
+    A_ub = get_constraints(payoff_tensor, coarse)
+    x = simplex(payoff_tensor.sum(axis=0).reshape(-1), A_ub)
+    assert x.min() >= 0
+    assert abs(x.sum() - 1) <= FEASIBILITY_TOLERANCE
+    assert (A_ub @ x).max() <= FEASIBILITY_TOLERANCE
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("coarse", [False, True])
+def test_simplex_matches_scipy(shape, coarse):
+  scipy_optimize = pytest.importorskip("scipy.optimize")
+  for seed in range(3):
+    payoff_tensor = random_payoff_tensor(shape, seed)
+    A_ub = get_constraints(payoff_tensor, coarse)
+    c = payoff_tensor.sum(axis=0).reshape(-1)
+    x = simplex(c, A_ub)
+    reference = scipy_optimize.linprog(-c, A_ub=A_ub, b_ub=np.zeros(len(A_ub)), A_eq=np.ones((1, len(c))), b_eq=np.ones(1), method="highs")
+    assert reference.status == 0
+    assert abs(c @ x + reference.fun) <= OPTIMUM_TOLERANCE
+
+
+def test_simplex_on_degenerate_integer_games():
+  # Small integer payoffs have many ties, which is where degenerate pivots show up
+  rng = np.random.default_rng(0)
+  for _ in range(50):
+    payoff_tensor = rng.integers(0, 3, size=(2, 4, 4)).astype(float)
+    for coarse in [False, True]:
+      A_ub = get_constraints(payoff_tensor, coarse)
+      x = simplex(payoff_tensor.sum(axis=0).reshape(-1), A_ub)
+      assert abs(x.sum() - 1) <= FEASIBILITY_TOLERANCE
+      assert (A_ub @ x).max() <= FEASIBILITY_TOLERANCE
+
+
+def test_correlated_equilibrium_without_scipy(monkeypatch):
+  # An import of None in sys.modules raises ImportError, so linprog falls back to simplex
+  monkeypatch.setitem(sys.modules, "scipy.optimize", None)
+  actions_list = list(range(8))
+  payoffs = np.random.default_rng(1).normal(size=(8, 8, 2))
+  payoff_function = {strategy: list(payoffs[strategy]) for strategy in itertools.product(actions_list, repeat=2)}
+  distribution = SimpleGame(["A", "B"], actions_list, payoff_function).calculate_correlated_equilibrium()
+  assert abs(sum(distribution.values()) - 1) <= FEASIBILITY_TOLERANCE
+
+
+def test_chicken_correlated_equilibrium():
+  payoff_function = {
+    ("Dare", "Dare"): [0, 0],
+    ("Dare", "Chicken"): [7, 2],
+    ("Chicken", "Dare"): [2, 7],
+    ("Chicken", "Chicken"): [6, 6],
+  }
+  game = SimpleGame(["A", "B"], ["Dare", "Chicken"], payoff_function)
+  distribution = game.calculate_correlated_equilibrium()
+  welfare = sum(prob*sum(payoff_function[strategy]) for strategy, prob in distribution.items())
+  assert welfare == pytest.approx(10.5)
+  assert distribution[("Chicken", "Chicken")] == pytest.approx(0.5)
@@ -0,0 +1,74 @@
+import pytest
+from GameTheoryPy.EvolutionaryGame import Agent, AgentSet, EvolutionaryGame
+
+np = pytest.importorskip("numpy")
+
+PAYOFF_FUNCTION = {
+  ("Cooperate", "Cooperate"): [6, 6],
+  ("Cooperate", "Defect"): [0, 10],
+  ("Defect", "Cooperate"): [10, 0],
+  ("Defect", "Defect"): [1, 1],
+}
+
+
+def tit_for_tat(player, player_list, history):
+  opponent_player = [i for i in player_list if i != player][0]
+  if len(history[opponent_player]) == 0:
+    return "Cooperate"
+  return history[opponent_player][-1]
+
+
+def always_defect(player, player_list, history):
+  return "Defect"
+
+
+STRATEGY_FUNCTION = {"tft": tit_for_tat, "alld": always_defect}
+
+
+def create_game(execution_error=0, mutation_rate=0, seed=None, agent_distribution=None):
+  return EvolutionaryGame(5, 3, 10, STRATEGY_FUNCTION, agent_distribution or {"tft": 30, "alld": 30}, PAYOFF_FUNCTION, execution_error, mutation_rate, seed)
+
+
+def test_trembles_shape_and_rate():
+  game = create_game(execution_error=0.1, seed=0)
+  trembles = game.draw_trembles(2000)
+  assert trembles.shape == (2000, 10, 2)
+  assert trembles.dtype == np.uint8
+  assert set(np.unique(trembles).tolist()) == {0, 1}
+  assert abs(trembles.mean() - 0.1) < 0.005
+
+
+def test_no_trembles_without_execution_error():
+  assert create_game().draw_trembles(10) is None
+
+
+def test_trembles_flip_the_chosen_actions():
+  agents = [Agent(0, "tft", tit_for_tat), Agent(1, "alld", always_defect)]
+  trembles = np.ones((3, 2), dtype=np.uint8)
+  # Every move is flipped, so always defect always plays Cooperate, which tit for tat copies and
+  # then plays as Defect
+  payoffs = EvolutionaryGame.play_game(3, agents[0], agents[1], PAYOFF_FUNCTION, trembles, ["Cooperate", "Defect"])
+  assert payoffs == [30, 0]
+
+
+def test_mutation_keeps_the_agent_count():
+  agent_set = AgentSet({"tft": 30, "alld": 30}, STRATEGY_FUNCTION)
+  rng = np.random.default_rng(0)
+  for rate in [0, 0.1, 0.5, 1]:
+    agent_distribution = agent_set.mutate_distribution({"tft": 500, "alld": 100}, rate, rng)
+    assert sum(agent_distribution.values()) == 600
+  assert agent_set.mutate_distribution({"tft": 500, "alld": 100}, 0, rng) == {"tft": 500, "alld": 100}
+  assert agent_set.mutate_distribution({"tft": 500, "alld": 100}, 1, rng) == {"tft": 100, "alld": 500}
+
+
+def test_mutation_rate():
+  agent_set = AgentSet({"tft": 30, "alld": 30}, STRATEGY_FUNCTION)
+  agent_distribution = agent_set.mutate_distribution({"tft": 100000, "alld": 0}, 0.2, np.random.default_rng(0))
+  assert abs(agent_distribution["alld"]/100000 - 0.2) < 0.01
+
+
+def test_seed_makes_simulation_reproducible():
+  histories = [create_game(execution_error=0.05, mutation_rate=0.05, seed=3).simulate(verbose=False) for _ in range(2)]
+  assert histories[0] == histories[1]
+  for generation in histories[0]:
+    assert sum(generation.values()) == 60
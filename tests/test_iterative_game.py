@@ -0,0 +1,50 @@
+import asyncio
+from GameTheoryPy.IterativeGame import IterativeGame
+
+PAYOFF_FUNCTION = {
+  ("Cooperate", "Cooperate"): [6, 6],
+  ("Cooperate", "Defect"): [0, 10],
+  ("Defect", "Cooperate"): [10, 0],
+  ("Defect", "Defect"): [1, 1],
+}
+
+
+def tit_for_tat(player, player_list, history):
+  opponent_player = [i for i in player_list if i != player][0]
+  if len(history[opponent_player]) == 0:
+    return "Cooperate"
+  return history[opponent_player][-1]
+
+
+async def async_tit_for_tat(player, player_list, history):
+  return tit_for_tat(player, player_list, history)
+
+
+def always_defect(player, player_list, history):
+  return "Defect"
+
+
+async def slow_defect(player, player_list, history):
+  await asyncio.sleep(10)
+  return "Defect"
+
+
+def create_game(strategy_function, iter_count=10):
+  return IterativeGame(["A", "B"], ["Cooperate", "Defect"], PAYOFF_FUNCTION, strategy_function, iter_count)
+
+
+def test_async_play_matches_sync_play():
+  expected = create_game({"A": tit_for_tat, "B": always_defect}).play_game(verbose=False)
+  payoffs = asyncio.run(create_game({"A": async_tit_for_tat, "B": always_defect}).play_game_async(verbose=False))
+  assert payoffs == expected == [9, 19]
+
+
+def test_timed_out_moves_play_the_default_action():
+  game = create_game({"A": tit_for_tat, "B": slow_defect}, iter_count=3)
+  payoffs = asyncio.run(game.play_game_async(timeout=0.01, default_action="Cooperate", verbose=False))
+  assert payoffs == [18, 18]
+
+
+def test_play_games_async():
+  games = [create_game({"A": async_tit_for_tat, "B": always_defect}) for _ in range(3)]
+  assert asyncio.run(IterativeGame.play_games_async(games)) == [[9, 19]]*3
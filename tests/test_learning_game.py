@@ -0,0 +1,40 @@
+import itertools
+import pytest
+from GameTheoryPy.CompactGame import SymmetricPayoff
+
+np = pytest.importorskip("numpy")
+from GameTheoryPy.LearningGame import LearningGame
+
+ROCK_PAPER_SCISSORS = {
+  (a, b): [((a_index - b_index + 1) % 3) - 1, ((b_index - a_index + 1) % 3) - 1]
+  for (a_index, a), (b_index, b) in itertools.product(enumerate(["Rock", "Paper", "Scissors"]), repeat=2)
+}
+
+
+@pytest.mark.parametrize("rule", LearningGame.RULES)
+def test_average_play_approaches_a_coarse_correlated_equilibrium(rule):
+  game = LearningGame(["A", "B"], ["Rock", "Paper", "Scissors"], ROCK_PAPER_SCISSORS, rule, 2000)
+  for _ in range(game.iter_count):
+    game.update_strategies()
+  assert game.get_equilibrium_gap() < 0.05
+  for strategy in game.get_average_strategies().values():
+    assert strategy == pytest.approx([1/3]*3, abs=0.05)
+
+
+def test_batched_games_match_single_games():
+  rng = np.random.default_rng(0)
+  actions_list = [0, 1, 2]
+  payoff_functions = [{strategy: list(rng.normal(size=2)) for strategy in itertools.product(actions_list, repeat=2)} for _ in range(4)]
+  batched_game = LearningGame(["A", "B"], actions_list, payoff_functions, "regret_matching", 200)
+  single_games = [LearningGame(["A", "B"], actions_list, payoff_function, "regret_matching", 200) for payoff_function in payoff_functions]
+  for _ in range(200):
+    batched_game.update_strategies()
+    for game in single_games:
+      game.update_strategies()
+  assert batched_game.get_equilibrium_gap() == pytest.approx([game.get_equilibrium_gap() for game in single_games])
+
+
+def test_compact_payoffs_are_rejected():
+  payoff_function = {(action, counts): 0 for action in [0, 1] for counts in SymmetricPayoff.count_vectors(1, 2)}
+  with pytest.raises(ValueError):
+    LearningGame(["A", "B"], [0, 1], SymmetricPayoff(["A", "B"], [0, 1], payoff_function), "hedge", 10)
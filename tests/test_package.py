@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_imported_modules(code):
+  output = subprocess.run([sys.executable, "-c", code + "\nimport sys\nprint(' '.join(sys.modules))"], cwd=ROOT, capture_output=True, text=True, check=True)
+  return set(output.stdout.split())
+
+
+def test_simple_game_import_is_light():
+  modules = get_imported_modules("from GameTheoryPy.SimpleGame import SimpleGame")
+  for name in ["numpy", "typing", "asyncio", "GameTheoryPy.IterativeGame"]:
+    assert name not in modules
+
+
+def test_iterative_game_import_does_not_import_numpy():
+  modules = get_imported_modules("from GameTheoryPy.IterativeGame import IterativeGame, SimpleIterativeGame")
+  assert "numpy" not in modules
+  assert "asyncio" not in modules
+
+
+def test_package_exports():
+  import GameTheoryPy
+  import GameTheoryPy.SimpleGame
+  from GameTheoryPy import SymmetricPayoff, SimpleIterativeGame, calculate_correlated_equilibrium
+  from GameTheoryPy.CompactGame import SymmetricPayoff as CompactSymmetricPayoff
+  assert GameTheoryPy.SimpleGame.SimpleGame.__name__ == "SimpleGame"
+  assert SymmetricPayoff is CompactSymmetricPayoff
+  assert SimpleIterativeGame.__module__ == "GameTheoryPy.IterativeGame"
+  assert callable(calculate_correlated_equilibrium)
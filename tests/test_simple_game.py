@@ -0,0 +1,30 @@
+import itertools
+import random
+from GameTheoryPy.SimpleGame import SimpleGame
+
+
+def random_payoff_function(rng, player_list, actions_list):
+  return {strategy: [rng.randint(0, 3) for _ in player_list] for strategy in itertools.product(actions_list, repeat=len(player_list))}
+
+
+def test_update_payoff_matches_full_recompute():
+  rng = random.Random(0)
+  player_list = ["A", "B", "C"]
+  actions_list = [0, 1, 2]
+  game = SimpleGame(player_list, actions_list, random_payoff_function(rng, player_list, actions_list))
+  game.calculate_nash_states()
+  for _ in range(300):
+    strategy = tuple(rng.choice(actions_list) for _ in player_list)
+    nash_states = game.update_payoff(strategy, [rng.randint(0, 3) for _ in player_list])
+    expected = SimpleGame(player_list, actions_list, game.payoff_function).calculate_nash_states()
+    assert set(nash_states) == set(expected)
+
+
+def test_update_payoff_does_not_change_callers_payoffs():
+  payoff_function = {(0, 0): [1, 1], (0, 1): [0, 2], (1, 0): [2, 0], (1, 1): [1, 1]}
+  values = [5, 5]
+  game = SimpleGame(["A", "B"], [0, 1], payoff_function)
+  game.update_payoff((0, 0), values)
+  values.append(0)
+  assert payoff_function[(0, 0)] == [1, 1]
+  assert game.payoff_function[(0, 0)] == [5, 5]